@@ -1,5 +1,6 @@
 import math
 import random
+import sys
 
 import pygame
 from typing import Iterable, Tuple
@@ -20,6 +21,10 @@ class Spark:
     def get_position(self):
         return self.path.calculate_position(self.distance)
 
+    def get_table_position(self):
+        # requires Path.build_table to have been called
+        return self.path.table[int(self.distance * self.path.table_step)]
+
     def move(self, dt: float):
         self.distance += self.velocity * dt
         if self.distance <= 0.0 or self.distance >= self.path.length:
@@ -34,6 +39,8 @@ class Path:
         self.points: [(float, float)] = tuple(points)
         self.length: float = 0.0
         self._calculate_length()
+        self.table: [(int, int)] = ()
+        self.table_step: float = 0.0
 
     def _calculate_length(self):
         last = None
@@ -59,12 +66,33 @@ class Path:
             last = p
         return None
 
+    def build_table(self, scale: (float, float), offset: (float, float), resolution: float):
+        # sample screen positions every `resolution` units along the path, so a
+        # spark's position is a single lookup instead of walking the segments
+        # one spare sample at the end keeps the lookup in range without clamping
+        count = int(self.length / resolution) + 2
+        table = []
+        for i in range(count):
+            p = self.calculate_position(min(i * resolution, self.length)) or self.points[-1]
+            table.append((int(p[0] * scale[0] - offset[0]), int(p[1] * scale[1] - offset[1])))
+        self.table = tuple(table)
+        self.table_step = 1.0 / resolution
+        return self.table_size()
+
+    def table_size(self):
+        # approximate memory use of the table in bytes
+        return sys.getsizeof(self.table) + sum(sys.getsizeof(p) for p in self.table)
+
 
 class Node:
     def __init__(self, name: str, rect: pygame.Rect):
         self.name = name
         self.rect = rect
         self.paths: [(Path, bool)] = []
+        self.leak = 2.0        # seconds for charge to decay to 1/e
+        self.refractory = 0.5  # seconds sparks are ignored after firing
+        self.last_update = 0.0
+        self.ready_at = 0.0
 
     def add_start(self, path: Path):
         self.paths.append((path, False))
@@ -77,12 +105,18 @@ class Node:
         sp = Spark(path[0], 200.0, path[1])
         return [sp]
 
-    def receive_spark(self, spark: Spark):
+    def decay(self, now: float):
+        # charge leaks lazily: the factor is only computed when a spark arrives
+        factor = math.exp((self.last_update - now) / self.leak)
+        self.last_update = now
+        return factor
+
+    def receive_spark(self, spark: Spark, now: float):
         return self.spawn_random_spark()
 
 
 class Pin(Node):
-    def receive_spark(self, spark: Spark):
+    def receive_spark(self, spark: Spark, now: float):
         # simply consume spark
         return []
 
@@ -93,10 +127,13 @@ class Neuron(Node):
         self.threshold = 4.0
         self.charge = 0.0
 
-    def receive_spark(self, spark: Spark):
-        self.charge += 1.0
+    def receive_spark(self, spark: Spark, now: float):
+        if now < self.ready_at:
+            return []
+        self.charge = self.charge * self.decay(now) + 1.0
         if self.charge >= self.threshold:
             self.charge = 0.0
+            self.ready_at = now + self.refractory
             sparks = []
             for path in self.paths:
                 sp = Spark(path[0], 200.0, path[1])
@@ -111,10 +148,13 @@ class BottomNeuron(Node):
         self.threshold = 4.0
         self.charge = 0.0
 
-    def receive_spark(self, spark: Spark):
-        self.charge += 1.0
+    def receive_spark(self, spark: Spark, now: float):
+        if now < self.ready_at:
+            return []
+        self.charge = self.charge * self.decay(now) + 1.0
         if self.charge >= self.threshold:
             self.charge = 0.0
+            self.ready_at = now + self.refractory
             sparks = []
             for path in self.paths:
                 sp = Spark(path[0], 200.0, path[1])
@@ -133,7 +173,12 @@ class BiNeuron(Node):
         self.paths_up: [int] = []
         self.paths_down: [int] = []
 
-    def receive_spark(self, spark: Spark):
+    def receive_spark(self, spark: Spark, now: float):
+        if now < self.ready_at:
+            return []
+        factor = self.decay(now)
+        self.charge_up *= factor
+        self.charge_down *= factor
         if spark.direction == "up":
             self.charge_up += 1.0
         else:
@@ -142,6 +187,7 @@ class BiNeuron(Node):
         if self.charge_up >= self.threshold:
             print("UP")
             self.charge_up = 0.0
+            self.ready_at = now + self.refractory
             for n in self.paths_up:
                 path = self.paths[n]
                 sp = Spark(path[0], 200.0, path[1])
@@ -150,6 +196,7 @@ class BiNeuron(Node):
         if self.charge_down >= self.threshold:
             print("DOWN")
             self.charge_down = 0.0
+            self.ready_at = now + self.refractory
             for n in self.paths_down:
                 path = self.paths[n]
                 sp = Spark(path[0], 200.0, path[1])
@@ -164,9 +211,11 @@ class Logo:
         self.nodes = []
         self.paths = []
         self.sparks = []
+        self.time = 0.0
         self.build()
 
     def move(self, dt: float):
+        self.time += dt
         sparks = []
         for spark in self.sparks:
             if spark.move(dt):
@@ -176,7 +225,7 @@ class Logo:
                     node = spark.path.start
                 else:
                     node = spark.path.end
-                new_sparks = node.receive_spark(spark)
+                new_sparks = node.receive_spark(spark, self.time)
                 for new_spark in new_sparks:
                     sparks.append(new_spark)
         self.sparks = sparks
@@ -187,6 +236,15 @@ class Logo:
         spark = Spark(pin.paths[0][0], 200.0)
         self.sparks.append(spark)
 
+    def build_tables(self, scale: (float, float), offset: (float, float), resolution: float):
+        total = 0
+        for path in self.paths:
+            size = path.build_table(scale, offset, resolution)
+            print(f"Table {path.start.name}->{path.end.name}: {len(path.table)} samples, {size} bytes")
+            total += size
+        print("Tables:", total, "bytes")
+        return total
+
     def add_hole(self, name: str, pos: (float, float)):
         diameter = 10.53
         r = pygame.Rect(pos[0] - diameter/2, pos[1] - diameter/2, diameter, diameter)
@@ -11,6 +11,8 @@ from logo import Path
 svg_size = 384, 384
 size = 1024, 1024
 scale = size[0] / svg_size[0], size[1] / svg_size[1]
+# precomputed spark positions, enable with --tables
+use_tables = "--tables" in sys.argv
 
 if __name__ == "__main__":
     pygame.init()
@@ -38,6 +40,7 @@ if __name__ == "__main__":
     spark_img.set_colorkey(spark_img.get_at((0, 0)))
     dc = logo.Logo()
     dt = 0.0
+    table_size = None
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -51,10 +54,20 @@ if __name__ == "__main__":
                     dc.go()
 #        screen.fill((0,0,0))
         screen.blit(logo_img, (0, 0))
-        for sp in dc.sparks:
-            p = sp.get_position()
-            p_scaled = p[0] * scale[0], p[1] * scale[1]
-            screen.blit(spark_img, (int(p_scaled[0] - spark_img.get_size()[0] / 2), int(p_scaled[1] - spark_img.get_size()[0] / 2)))
+        if use_tables:
+            if table_size != screen.get_size():
+                # rebuild tables whenever output size changes, one sample per pixel
+                table_size = screen.get_size()
+                table_scale = table_size[0] / svg_size[0], table_size[1] / svg_size[1]
+                spark_offset = spark_img.get_size()[0] / 2, spark_img.get_size()[0] / 2
+                dc.build_tables(table_scale, spark_offset, 1.0 / max(table_scale))
+            for sp in dc.sparks:
+                screen.blit(spark_img, sp.get_table_position())
+        else:
+            for sp in dc.sparks:
+                p = sp.get_position()
+                p_scaled = p[0] * scale[0], p[1] * scale[1]
+                screen.blit(spark_img, (int(p_scaled[0] - spark_img.get_size()[0] / 2), int(p_scaled[1] - spark_img.get_size()[0] / 2)))
 #        screen.blit(node_img, (0, 0))
         pygame.display.update()
         dt = clock.tick(60) / 1000.0